@@ -1,18 +1,49 @@
 """The Nemy integration."""
+import logging
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY
+from homeassistant.const import CONF_API_KEY, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.typing import ConfigType
 
 from .api import NemyApi
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    CONF_MIGRATE_STATISTICS,
+    CONF_REQUESTS_PER_DAY,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_STATE,
+    DEFAULT_REQUESTS_PER_DAY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import NemyDataUpdateCoordinator
+from .history import NemyIntervalHistory, history_path
+from .services import async_setup_services
+
+_LOGGER = logging.getLogger(__name__)
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Nemy services."""
+    await async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Nemy from a config entry."""
     session = async_get_clientsession(hass)
     api = NemyApi(entry.data[CONF_API_KEY], entry.data["state"], session)
-    coordinator = NemyDataUpdateCoordinator(hass, api)
+    api.set_rate_limits(
+        entry.options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+        entry.options.get(CONF_REQUESTS_PER_DAY, DEFAULT_REQUESTS_PER_DAY),
+    )
+    coordinator = NemyDataUpdateCoordinator(
+        hass, api, entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -20,10 +51,64 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    if entry.data.get(CONF_MIGRATE_STATISTICS):
+        entry.async_create_background_task(
+            hass, async_migrate_statistics(hass, entry), f"{DOMAIN} statistics migration"
+        )
+
     return True
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator without reloading."""
+    coordinator: NemyDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.api.set_rate_limits(
+        entry.options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+        entry.options.get(CONF_REQUESTS_PER_DAY, DEFAULT_REQUESTS_PER_DAY),
+    )
+    coordinator.async_set_scan_interval(
+        entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version == 1:
+        # Version 2 records prices as measurements instead of totals. Existing
+        # statistics are converted after setup so a failure cannot block it
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_MIGRATE_STATISTICS: True}, version=2
+        )
+        _LOGGER.debug("Migrated config entry %s to version 2", entry.entry_id)
+
+    return True
+
+async def async_migrate_statistics(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Convert price statistics recorded before version 2, retrying on the next start."""
+    # Imported here so the recorder is only loaded when there is something to migrate
+    from .migration import (  # pylint: disable=import-outside-toplevel
+        async_migrate_price_statistics,
+    )
+
+    try:
+        await async_migrate_price_statistics(hass, entry)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.warning(
+            "Unable to migrate price statistics, retrying on next start: %s", err
+        )
+        return
+
+    data = {**entry.data}
+    data.pop(CONF_MIGRATE_STATISTICS)
+    hass.config_entries.async_update_entry(entry, data=data)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the interval history log of a removed entry."""
+    history = NemyIntervalHistory(history_path(hass, entry.data[CONF_STATE]))
+    await hass.async_add_executor_job(history.remove)
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from collections import deque
 import logging
 
+from .const import DEFAULT_REQUESTS_PER_DAY, DEFAULT_REQUESTS_PER_MINUTE
+
 _LOGGER = logging.getLogger(__name__)
 
 class NemyApiError(Exception):
@@ -16,6 +18,11 @@ class NemyDataValidationError(NemyApiError):
 class NemyRateLimitError(NemyApiError):
     """Exception for rate limit errors."""
 
+    def __init__(self, message: str, retry_after: int | None = None) -> None:
+        """Initialize the error with an optional retry delay in seconds."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
 class NemyApi:
     """Nemy API client."""
 
@@ -55,11 +62,23 @@ class NemyApi:
         self._base_url = "https://nemy.p.rapidapi.com"
         
         # Rate limiting setup
-        self._requests_per_minute = 30  # RapidAPI Basic tier limit
-        self._requests_per_day = 1000   # RapidAPI Basic tier limit
+        self._requests_per_minute = DEFAULT_REQUESTS_PER_MINUTE
+        self._requests_per_day = DEFAULT_REQUESTS_PER_DAY
         self._minute_requests = deque(maxlen=self._requests_per_minute)
         self._daily_requests = deque(maxlen=self._requests_per_day)
 
+    def set_rate_limits(self, requests_per_minute: int, requests_per_day: int) -> None:
+        """Update the rate limit budget, keeping already recorded requests.
+        
+        Args:
+            requests_per_minute: Maximum requests allowed in any minute
+            requests_per_day: Maximum requests allowed in any day
+        """
+        self._requests_per_minute = requests_per_minute
+        self._requests_per_day = requests_per_day
+        self._minute_requests = deque(self._minute_requests, maxlen=requests_per_minute)
+        self._daily_requests = deque(self._daily_requests, maxlen=requests_per_day)
+
     def _validate_data(self, data: dict) -> None:
         """Validate the API response data.
         
@@ -128,13 +147,17 @@ class NemyApi:
                     f"Invalid numeric value for {field}: {data[field]}"
                 )
 
+    def _now(self) -> datetime:
+        """Return the current time used for rate limiting."""
+        return datetime.now()
+
     def _check_rate_limits(self) -> None:
         """Check if we're within rate limits.
         
         Raises:
             NemyRateLimitError: If rate limits would be exceeded
         """
-        now = datetime.now()
+        now = self._now()
         minute_ago = now - timedelta(minutes=1)
         day_ago = now - timedelta(days=1)
 
@@ -148,18 +171,20 @@ class NemyApi:
         if len(self._minute_requests) >= self._requests_per_minute:
             retry_after = (self._minute_requests[0] + timedelta(minutes=1) - now).seconds
             raise NemyRateLimitError(
-                f"Per-minute rate limit exceeded. Retry after {retry_after} seconds"
+                f"Per-minute rate limit exceeded. Retry after {retry_after} seconds",
+                retry_after,
             )
 
         if len(self._daily_requests) >= self._requests_per_day:
             retry_after = (self._daily_requests[0] + timedelta(days=1) - now).seconds
             raise NemyRateLimitError(
-                f"Daily rate limit exceeded. Retry after {retry_after} seconds"
+                f"Daily rate limit exceeded. Retry after {retry_after} seconds",
+                retry_after,
             )
 
     def _record_request(self) -> None:
         """Record a successful API request."""
-        now = datetime.now()
+        now = self._now()
         self._minute_requests.append(now)
         self._daily_requests.append(now)
 
@@ -4,12 +4,22 @@ import logging
 from typing import Any
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_API_KEY
+from homeassistant.const import CONF_API_KEY, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import NemyApi, NemyApiError, NemyRateLimitError
-from .const import DOMAIN, CONF_STATE
+from .const import (
+    DOMAIN,
+    CONF_STATE,
+    CONF_REQUESTS_PER_DAY,
+    CONF_REQUESTS_PER_MINUTE,
+    DEFAULT_REQUESTS_PER_DAY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,7 +28,15 @@ VALID_STATES = ["NSW1", "QLD1", "SA1", "TAS1", "VIC1", "NEM"]
 class NemyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Nemy."""
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return NemyOptionsFlow(config_entry)
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle the initial step."""
@@ -75,4 +93,49 @@ class NemyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+class NemyOptionsFlow(config_entries.OptionsFlow):
+    """Handle Nemy options.
+
+    Changes are applied to the running coordinator and rate limiter by the
+    entry's update listener, without reloading the entry.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Manage the polling and rate limit options."""
+        errors = {}
+
+        if user_input is not None:
+            # Make sure the polling interval fits within the daily budget
+            daily_polls = 86400 / user_input[CONF_SCAN_INTERVAL]
+            if daily_polls > user_input[CONF_REQUESTS_PER_DAY]:
+                errors[CONF_SCAN_INTERVAL] = "exceeds_daily_budget"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+                    vol.Required(
+                        CONF_REQUESTS_PER_MINUTE,
+                        default=options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_REQUESTS_PER_DAY,
+                        default=options.get(CONF_REQUESTS_PER_DAY, DEFAULT_REQUESTS_PER_DAY),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                }
+            ),
+            errors=errors,
+        )
@@ -4,12 +4,35 @@ from typing import Final
 DOMAIN: Final = "nemy"
 CONF_API_KEY: Final = "api_key"
 CONF_STATE: Final = "state"
+# Set on entries migrated from version 1 until their price statistics are converted
+CONF_MIGRATE_STATISTICS: Final = "migrate_statistics"
 
 DEFAULT_SCAN_INTERVAL: Final = 300  # 5 minutes
+MIN_SCAN_INTERVAL: Final = 30
+
+# Rate limiting, defaults match the RapidAPI Basic tier
+CONF_REQUESTS_PER_MINUTE: Final = "requests_per_minute"
+CONF_REQUESTS_PER_DAY: Final = "requests_per_day"
+DEFAULT_REQUESTS_PER_MINUTE: Final = 30
+DEFAULT_REQUESTS_PER_DAY: Final = 1000
 PLATFORMS: Final = ["sensor"]
 
+# Price sensors, recorded as measurements since config entry version 2
+PRICE_SENSOR_KEYS: Final = ["price_household", "price_dispatch"]
+
 # Attribution required by Home Assistant
 ATTRIBUTION: Final = "Data provided by Nemy Energy API"
 
 # Valid states
-VALID_STATES: Final = ["NSW1", "QLD1", "SA1", "TAS1", "VIC1", "NEM"]
\ No newline at end of file
+VALID_STATES: Final = ["NSW1", "QLD1", "SA1", "TAS1", "VIC1", "NEM"]
+
+# Services
+SERVICE_EXPORT: Final = "export"
+SERVICE_PROFILE: Final = "profile"
+ATTR_REGION: Final = "region"
+ATTR_START: Final = "start"
+ATTR_END: Final = "end"
+ATTR_FILENAME: Final = "filename"
+ATTR_CYCLES: Final = "cycles"
+ATTR_MODE: Final = "mode"
+ATTR_ALLOCATIONS: Final = "allocations"
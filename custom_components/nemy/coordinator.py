@@ -1,33 +1,105 @@
 """DataUpdateCoordinator for the Nemy integration."""
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 import logging
 from typing import Any
 from collections import deque
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
 from .api import NemyApi, NemyApiError, NemyDataValidationError, NemyRateLimitError
+from .history import HISTORY_RETENTION_DAYS, NemyIntervalHistory, history_path
+from .profiler import NemyUpdateProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
 class NemyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching data from Nemy API."""
 
-    def __init__(self, hass: HomeAssistant, api: NemyApi) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: NemyApi,
+        scan_interval: int = DEFAULT_SCAN_INTERVAL,
+    ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=timedelta(seconds=scan_interval),
         )
         self.api = api
+        self.scan_interval = timedelta(seconds=scan_interval)
         # Add diagnostic tracking
         self._update_history = deque(maxlen=50)  # Keep last 50 updates
         self.last_exception = None
         self.last_update_success_time = None
+        # Interval log used by the export service
+        self.history = NemyIntervalHistory(history_path(hass, api._state))
+        self._last_prune: date | None = None
+        # On-demand profiling, None unless requested via the profile service
+        self.profiler: NemyUpdateProfiler | None = None
+        self.last_profile: dict[str, Any] | None = None
+
+    @callback
+    def async_set_scan_interval(self, scan_interval: int) -> None:
+        """Change the polling interval in place without triggering a refresh.
+
+        While a rate-limit backoff is longer than the new interval it is kept,
+        and the new interval applies after the next successful update.
+        """
+        backing_off = self.update_interval != self.scan_interval
+        self.scan_interval = timedelta(seconds=scan_interval)
+        if self.update_interval == self.scan_interval or (
+            backing_off and self.update_interval > self.scan_interval
+        ):
+            return
+        self.update_interval = self.scan_interval
+        # Re-arm the pending poll so the new interval applies from now
+        if self._listeners:
+            self._schedule_refresh()
+
+    def start_profiling(self, profiler: NemyUpdateProfiler) -> None:
+        """Profile the next refresh cycles with the given profiler."""
+        self.profiler = profiler
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, profiling the cycle when a profiler is active.
+
+        Covers the API request, history bookkeeping, validation and the
+        listener fan-out to entities.
+        """
+        if (profiler := self.profiler) is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Another profiler (e.g. the profiler integration) already owns the hooks
+            _LOGGER.warning("Unable to start profiling: %s", err)
+            self.profiler = None
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.disable()
+        # Snapshotting allocations blocks, keep it off the loop being measured
+        await self.hass.async_add_executor_job(profiler.collect_allocations)
+
+        if profiler.done:
+            self.profiler = None
+            self.last_profile = await self.hass.async_add_executor_job(profiler.finish)
+            _LOGGER.info(
+                "Profiled %d update cycles, stats written to %s",
+                profiler.cycles_completed,
+                profiler.path,
+            )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via API.
@@ -42,6 +114,7 @@ class NemyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         success = False
         error = None
         data = None
+        backoff = False
 
         try:
             # Log diagnostic information if recent failures
@@ -56,13 +129,16 @@ class NemyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             success = True
             self.last_exception = None
             self.last_update_success_time = datetime.now()
+            await self._async_record_interval(data)
             return data
 
         except NemyRateLimitError as err:
             error = err
             _LOGGER.warning("Rate limit exceeded: %s", err)
             # Increase update interval temporarily when rate limited
-            self.update_interval = timedelta(seconds=int(str(err).split("after ")[1].split(" ")[0]))
+            if err.retry_after:
+                self.update_interval = timedelta(seconds=err.retry_after)
+                backoff = True
             raise UpdateFailed(f"Rate limit exceeded: {err}") from err
 
         except NemyDataValidationError as err:
@@ -99,9 +175,10 @@ class NemyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if error:
                 self.last_exception = error
 
-            # Reset update interval to default after any error
-            if self.update_interval != timedelta(seconds=DEFAULT_SCAN_INTERVAL):
-                self.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+            # Return to the configured interval unless this cycle backed off,
+            # so the next poll waits out the rate limit
+            if not backoff and self.update_interval != self.scan_interval:
+                self.update_interval = self.scan_interval
                 
             # Log extended diagnostic info on failures
             if not success:
@@ -109,4 +186,23 @@ class NemyDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     "Update failed - Duration: %.2fs, Error: %s",
                     duration,
                     error
-                )
\ No newline at end of file
+                )
+
+    async def _async_record_interval(self, data: dict[str, Any]) -> None:
+        """Append the fetched interval to the history log without failing the update.
+
+        Rows past the retention period are pruned once a day.
+        """
+        try:
+            await self.hass.async_add_executor_job(self.history.append, data)
+            today = dt_util.utcnow().date()
+            if self._last_prune != today:
+                self._last_prune = today
+                removed = await self.hass.async_add_executor_job(
+                    self.history.prune,
+                    dt_util.utcnow() - timedelta(days=HISTORY_RETENTION_DAYS),
+                )
+                if removed:
+                    _LOGGER.debug("Pruned %d intervals from the history log", removed)
+        except OSError as err:
+            _LOGGER.warning("Unable to record interval history: %s", err)
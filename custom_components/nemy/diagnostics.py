@@ -32,6 +32,8 @@ async def async_get_config_entry_diagnostics(
                 "state": coordinator.api._state,
                 "update_interval": coordinator.update_interval.total_seconds(),
                 "default_update_interval": DEFAULT_SCAN_INTERVAL,
+                "configured_update_interval": coordinator.scan_interval.total_seconds(),
+                "options": dict(entry.options),
                 "last_update_success": coordinator.last_update_success,
                 "last_update": coordinator.last_update.isoformat() if coordinator.last_update else None,
             },
@@ -102,6 +104,15 @@ async def async_get_config_entry_diagnostics(
                     })
             diagnostics["update_history"] = update_history
 
+        # Add profiling status and the summary of the last profiling run
+        diagnostics["profiling"] = {
+            "active": coordinator.profiler is not None,
+            "cycles_remaining": (
+                coordinator.profiler.cycles - coordinator.profiler.cycles_completed
+            ) if coordinator.profiler else 0,
+            "last_profile": coordinator.last_profile,
+        }
+
         return diagnostics
 
     except Exception as err:
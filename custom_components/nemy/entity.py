@@ -13,6 +13,8 @@ class NemyEntity(CoordinatorEntity[NemyDataUpdateCoordinator]):
 
     _attr_has_entity_name = True
     _attr_attribution = ATTRIBUTION
+    # Volatile or constant attributes, kept out of the recorder's state attributes
+    _unrecorded_attributes = frozenset({"state", "last_update", "update_success"})
 
     def __init__(
         self,
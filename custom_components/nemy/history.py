@@ -0,0 +1,192 @@
+"""Interval history storage and export for the Nemy integration."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import csv
+from datetime import datetime
+from itertools import islice
+import logging
+import os
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from .api import NemyApi
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_FIELDS = list(NemyApi.REQUIRED_FIELDS)
+HISTORY_RETENTION_DAYS = 400  # Just over a year, enough for annual tariff analysis
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def history_path(hass: HomeAssistant, state: str) -> str:
+    """Return the path of the interval log for a region."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}_history_{state}.csv")
+
+
+def _parse_interval(value: str | None) -> datetime | None:
+    """Parse a stored time_interval into an aware UTC datetime."""
+    interval = dt_util.parse_datetime(value or "")
+    return dt_util.as_utc(interval) if interval else None
+
+
+class NemyIntervalHistory:
+    """Append-only CSV log of the dispatch intervals collected for a region.
+
+    One row is written per new ``time_interval``, in chronological order, so
+    months of data can be exported by streaming the file instead of querying
+    the recorder. All file access is blocking and must run in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the history log."""
+        self.path = path
+        self._last_interval: datetime | None = None
+
+    def append(self, data: dict) -> bool:
+        """Append an API payload if it is newer than the last stored interval.
+
+        Returns:
+            True if a row was written, False if the interval was a repeat,
+            out of order or could not be parsed.
+        """
+        interval = _parse_interval(str(data["time_interval"]))
+        if interval is None:
+            _LOGGER.debug("Not recording interval with invalid time: %s", data["time_interval"])
+            return False
+        if self._last_interval is None:
+            self._last_interval = self._read_last_interval()
+        if self._last_interval is not None and interval <= self._last_interval:
+            return False
+
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            writer.writerow(data)
+
+        self._last_interval = interval
+        return True
+
+    def _read_last_interval(self) -> datetime | None:
+        """Return the interval of the last stored row, reading only the file tail."""
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                file.seek(max(file.tell() - 4096, 0))
+                lines = file.read().decode("utf-8", errors="ignore").splitlines()
+        except FileNotFoundError:
+            return None
+
+        if len(lines) < 2:
+            return None
+        return _parse_interval(next(csv.reader([lines[-1]]))[0])
+
+    def prune(self, before: datetime) -> int:
+        """Drop rows older than ``before`` by rewriting the log.
+
+        Returns:
+            The number of rows removed.
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        before = dt_util.as_utc(before)
+        removed = 0
+        temp_path = f"{self.path}.tmp"
+        with open(self.path, newline="", encoding="utf-8") as source, open(
+            temp_path, "w", newline="", encoding="utf-8"
+        ) as target:
+            writer = csv.DictWriter(target, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in csv.DictReader(source):
+                interval = _parse_interval(row.get("time_interval"))
+                if interval is None or interval < before:
+                    removed += 1
+                    continue
+                writer.writerow(row)
+
+        if removed:
+            os.replace(temp_path, self.path)
+        else:
+            os.remove(temp_path)
+        return removed
+
+    def remove(self) -> None:
+        """Delete the log."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._last_interval = None
+
+    def iter_rows(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[dict[str, str]]:
+        """Yield stored rows whose interval falls within [start, end).
+
+        ``append`` only accepts newer intervals, so rows are in chronological
+        order and reading stops at the first row past ``end``.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        start = dt_util.as_utc(start) if start else None
+        end = dt_util.as_utc(end) if end else None
+
+        with open(self.path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                interval = _parse_interval(row.get("time_interval"))
+                if interval is None:
+                    _LOGGER.debug("Skipping history row with invalid interval: %s", row)
+                    continue
+                if start and interval < start:
+                    continue
+                if end and interval >= end:
+                    break
+                yield row
+
+
+def _iter_chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[list[dict]]:
+    """Group rows into lists of at most chunk_size items."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _write_csv(chunks: Iterator[list[dict]], target: str) -> int:
+    """Write row chunks to a new CSV file, refusing to overwrite an existing one."""
+    count = 0
+    with open(target, "x", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def export_history(
+    history: NemyIntervalHistory,
+    target: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """Stream stored intervals to a CSV file.
+
+    This is blocking and must run in the executor.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        FileExistsError: If the target file already exists.
+    """
+    return _write_csv(_iter_chunks(history.iter_rows(start, end), chunk_size), target)
@@ -0,0 +1,122 @@
+"""Statistics migration for the Nemy integration."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import partial
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    get_metadata,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_STATE, DOMAIN, PRICE_SENSOR_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Both statistics tables hold sums for the old total-based price sensors.
+# Rows are written with Recorder.async_import_statistics, the database
+# tables and a hand-built StatisticMetaData, which are recorder internals.
+# The public async_import_statistics helper only writes the hourly table.
+# This path skips its metadata validation and compatibility handling, so
+# it will need updating if the metadata schema changes.
+STATISTICS_TABLES = {"hour": Statistics, "5minute": StatisticsShortTerm}
+
+
+async def async_migrate_price_statistics(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Convert price statistics from running sums to mean/min/max.
+
+    Price sensors used to be recorded as totals, so each hourly and
+    5-minute row only holds the last price of its period. That price is
+    written back as the period's mean, min and max, and the sum columns are
+    cleared.
+
+    Imports run on the recorder thread and report no errors back, so this
+    waits for them to finish and checks the metadata was rewritten.
+
+    Raises:
+        HomeAssistantError: If the recorder database is not ready or the
+            statistics were not rewritten.
+    """
+    if "recorder" not in hass.config.components:
+        return
+
+    registry = er.async_get(hass)
+    instance = get_instance(hass)
+    if not await instance.async_db_ready:
+        raise HomeAssistantError("Recorder database is not ready")
+
+    migrated: dict[str, dict[str, int]] = {}
+    for key in PRICE_SENSOR_KEYS:
+        unique_id = f"{entry.entry_id}_{entry.data[CONF_STATE]}_{key}"
+        if (entity_id := registry.async_get_entity_id("sensor", DOMAIN, unique_id)) is None:
+            continue
+
+        metadata = await instance.async_add_executor_job(
+            partial(get_metadata, hass, statistic_ids={entity_id})
+        )
+        if entity_id not in metadata or not metadata[entity_id][1]["has_sum"]:
+            continue
+
+        old_metadata = metadata[entity_id][1]
+        new_metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=old_metadata["name"],
+            source=old_metadata["source"],
+            statistic_id=entity_id,
+            unit_of_measurement=old_metadata["unit_of_measurement"],
+        )
+
+        migrated[entity_id] = {}
+        for period, table in STATISTICS_TABLES.items():
+            rows = await instance.async_add_executor_job(
+                statistics_during_period,
+                hass,
+                EPOCH,
+                None,
+                {entity_id},
+                period,
+                None,
+                {"state"},
+            )
+            statistics = [
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(row["start"]),
+                    mean=row["state"],
+                    min=row["state"],
+                    max=row["state"],
+                )
+                for row in rows.get(entity_id, [])
+                if row.get("state") is not None
+            ]
+            instance.async_import_statistics(new_metadata, statistics, table)
+            migrated[entity_id][period] = len(statistics)
+
+    if not migrated:
+        return
+
+    await instance.async_block_till_done()
+    metadata = await instance.async_add_executor_job(
+        partial(get_metadata, hass, statistic_ids=set(migrated))
+    )
+    for entity_id, counts in migrated.items():
+        if entity_id not in metadata or metadata[entity_id][1]["has_sum"]:
+            raise HomeAssistantError(f"Statistics of {entity_id} were not rewritten")
+        for period, count in counts.items():
+            _LOGGER.info(
+                "Migrated %d %s statistics of %s to mean/min/max",
+                count,
+                period,
+                entity_id,
+            )
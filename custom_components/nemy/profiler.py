@@ -0,0 +1,296 @@
+"""On-demand profiling of Nemy coordinator update cycles."""
+from __future__ import annotations
+
+from collections import Counter
+import cProfile
+from datetime import datetime
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_MODES = ["deterministic", "sampling"]
+SAMPLE_INTERVAL = 0.005  # 5 ms between stack samples
+TOP_ENTRIES = 20
+TRACEMALLOC_FRAMES = 25
+
+# Stats are restricted to code in this package so other integrations running
+# on the loop while the refresh awaits the API do not show up
+INTEGRATION_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILER_FILE = os.path.abspath(__file__)
+
+
+def _is_integration_file(filename: str) -> bool:
+    """Return True if the file belongs to this integration, excluding the profiler."""
+    return filename.startswith(INTEGRATION_DIR + os.sep) and filename != PROFILER_FILE
+
+
+def _frame_label(code) -> str:
+    """Return a pstats-style label for a code object."""
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+class _StackSampler:
+    """Sample the stack of a single thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """Initialize the sampler."""
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="nemy_profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the sampling thread to stop."""
+        self._stop.set()
+
+    def join(self) -> None:
+        """Wait for the sampling thread to exit."""
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Record the target thread's stack until stopped."""
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+
+class NemyUpdateProfiler:
+    """Profile the next N coordinator refresh cycles.
+
+    ``enable`` and ``disable`` bracket a single refresh on the event loop.
+    ``collect_allocations`` and ``finish`` are blocking and must run in the
+    executor. Only time and allocations attributable to Nemy code are kept.
+
+    tracemalloc snapshots only see blocks that are still alive, so per-site
+    allocations are the memory a cycle retained. Short-lived allocations
+    are reflected in the peak traced memory of each cycle instead.
+    """
+
+    def __init__(
+        self,
+        cycles: int,
+        path: str,
+        mode: str = "deterministic",
+        track_allocations: bool = True,
+    ) -> None:
+        """Initialize the profiler."""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {mode}")
+        self.cycles = cycles
+        self.path = path
+        self.mode = mode
+        self.track_allocations = track_allocations
+        self.cycles_completed = 0
+        self.started: datetime | None = None
+        self.profiled_seconds = 0.0
+        self._cycle_start: datetime | None = None
+        self._profile = cProfile.Profile() if mode == "deterministic" else None
+        self._samplers: list[_StackSampler] = []
+        self._allocations: Counter[str] = Counter()
+        self._allocation_sizes: Counter[str] = Counter()
+        self._peak_sizes: list[int] = []
+        self._owns_tracemalloc = False
+
+    @property
+    def done(self) -> bool:
+        """Return True once all requested cycles have been profiled."""
+        return self.cycles_completed >= self.cycles
+
+    def enable(self) -> None:
+        """Start profiling a refresh cycle."""
+        self._cycle_start = datetime.now()
+        if self.started is None:
+            self.started = self._cycle_start
+
+        # cProfile raises if another profiler holds the hook, so it is
+        # enabled before tracemalloc to avoid leaving tracing running
+        if self._profile is not None:
+            self._profile.enable()
+        else:
+            sampler = _StackSampler(threading.get_ident(), SAMPLE_INTERVAL)
+            self._samplers.append(sampler)
+            sampler.start()
+
+        if self.track_allocations and not tracemalloc.is_tracing():
+            # Deep tracebacks let allocations made by helpers on Nemy's behalf
+            # be attributed to the Nemy line that triggered them
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+
+    def disable(self) -> None:
+        """Stop profiling the current refresh cycle."""
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._samplers[-1].stop()
+
+        if self._owns_tracemalloc:
+            # Tracing started with this cycle, so the peak covers everything
+            # it allocated, including blocks already freed
+            self._peak_sizes.append(tracemalloc.get_traced_memory()[1])
+
+        self.profiled_seconds += (datetime.now() - self._cycle_start).total_seconds()
+        self.cycles_completed += 1
+
+    def collect_allocations(self) -> None:
+        """Snapshot and stop tracemalloc, keeping blocks Nemy code still holds."""
+        if not self._owns_tracemalloc:
+            return
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(True, os.path.join(INTEGRATION_DIR, "*"), all_frames=True),
+                tracemalloc.Filter(False, PROFILER_FILE, all_frames=True),
+            ]
+        )
+        tracemalloc.stop()
+        self._owns_tracemalloc = False
+
+        for stat in snapshot.statistics("traceback"):
+            # Attribute to the innermost Nemy frame of the allocation
+            frame = next(
+                frame for frame in reversed(stat.traceback)
+                if _is_integration_file(frame.filename)
+            )
+            location = f"{frame.filename}:{frame.lineno}"
+            self._allocations[location] += stat.count
+            self._allocation_sizes[location] += stat.size
+
+    def finish(self) -> dict[str, Any]:
+        """Write the collected stats to disk and return a summary."""
+        summary: dict[str, Any] = {
+            "mode": self.mode,
+            "cycles": self.cycles_completed,
+            "started": self.started.isoformat() if self.started else None,
+            "finished": datetime.now().isoformat(),
+            "profiled_seconds": round(self.profiled_seconds, 4),
+            "output": self.path,
+        }
+
+        if self._profile is not None:
+            summary["top_functions"] = self._top_deterministic()
+        else:
+            summary["top_functions"] = self._top_sampled()
+
+        if self.track_allocations:
+            summary["peak_traced_kib"] = round(max(self._peak_sizes, default=0) / 1024, 1)
+            summary["retained_allocations"] = [
+                {
+                    "location": location,
+                    "count": count,
+                    "size_kib": round(self._allocation_sizes[location] / 1024, 1),
+                }
+                for location, count in self._allocations.most_common(TOP_ENTRIES)
+            ]
+
+        return summary
+
+    def _top_deterministic(self) -> list[dict[str, Any]]:
+        """Write Nemy's cProfile stats and return its top functions by cumulative time.
+
+        Kept are functions defined in this package, plus the functions they
+        call directly, counted only for calls made from Nemy code. Coroutine
+        time is counted per resumption, so time spent awaiting the API is not
+        included.
+        """
+        stats = pstats.Stats(self._profile)
+        all_stats = stats.stats  # pylint: disable=no-member
+        own = {
+            func: entry for func, entry in all_stats.items()
+            if _is_integration_file(func[0])
+        }
+        callees = {}
+        for func, (_, _, _, _, callers) in all_stats.items():
+            if func in own:
+                continue
+            edges = {caller: edge for caller, edge in callers.items() if caller in own}
+            if edges:
+                # Caller edges hold (calls, primitive calls, total, cumulative)
+                calls, primitive, total, cumulative = (sum(values) for values in zip(*edges.values()))
+                callees[func] = (primitive, calls, total, cumulative, edges)
+        stats.stats = {**own, **callees}  # pylint: disable=attribute-defined-outside-init
+        stats.dump_stats(self.path)
+
+        rows = sorted(
+            stats.stats.items(),
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        return [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_seconds": round(total, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in rows[:TOP_ENTRIES]
+        ]
+
+    def _top_sampled(self) -> list[dict[str, Any]]:
+        """Write folded stacks and return the top functions by cumulative samples.
+
+        The folded file keeps full stacks. The summary only ranks Nemy frames
+        and the frames they call directly, as ``_top_deterministic`` does, so
+        event loop frames present in every sample do not crowd it out.
+        """
+        stacks: Counter[tuple[str, ...]] = Counter()
+        for sampler in self._samplers:
+            sampler.join()
+            stacks.update(sampler.stacks)
+
+        # Drop samples taken while the refresh was suspended and other code ran
+        stacks = Counter(
+            {
+                stack: count for stack, count in stacks.items()
+                if any(_is_integration_file(label.rsplit(":", 1)[0]) for label in stack)
+            }
+        )
+
+        cumulative: Counter[str] = Counter()
+        own: Counter[str] = Counter()
+        for stack, count in stacks.items():
+            nemy = [_is_integration_file(label.rsplit(":", 1)[0]) for label in stack]
+            last = max(index for index, is_nemy in enumerate(nemy) if is_nemy)
+            kept = [
+                label for index, label in enumerate(stack[: last + 2])
+                if nemy[index] or (index and nemy[index - 1])
+            ]
+            for label in set(kept):
+                cumulative[label] += count
+            own[kept[-1]] += count
+
+        # Folded stack format, usable with flamegraph tools
+        with open(self.path, "w", encoding="utf-8") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{';'.join(stack)} {count}\n")
+
+        return [
+            {
+                "function": label,
+                "samples": own[label],
+                "cumulative_samples": count,
+                "cumulative_seconds": round(count * SAMPLE_INTERVAL, 4),
+            }
+            for label, count in cumulative.most_common(TOP_ENTRIES)
+        ]
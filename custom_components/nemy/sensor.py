@@ -5,7 +5,6 @@ from dataclasses import dataclass
 from typing import Any, Final
 
 from homeassistant.components.sensor import (
-    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
@@ -36,8 +35,9 @@ SENSOR_TYPES: Final = [
         name="Household Price",
         native_unit_of_measurement=CURRENCY_CENT,
         suggested_display_precision=2,
-        device_class=SensorDeviceClass.MONETARY,
-        state_class=SensorStateClass.TOTAL,  # Changed from MEASUREMENT to TOTAL
+        # Instantaneous price: MEASUREMENT gives mean/min/max statistics, and
+        # MONETARY is dropped as it only allows TOTAL
+        state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda x: float(x),
         entity_registry_enabled_default=True,
         icon="mdi:currency-usd",
@@ -48,8 +48,7 @@ SENSOR_TYPES: Final = [
         name="Dispatch Price",
         native_unit_of_measurement=CURRENCY_DOLLAR,
         suggested_display_precision=2,
-        device_class=SensorDeviceClass.MONETARY,
-        state_class=SensorStateClass.TOTAL,  # Changed from MEASUREMENT to TOTAL
+        state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda x: float(x),
         entity_registry_enabled_default=True,
         icon="mdi:currency-usd",
@@ -114,6 +113,7 @@ class NemySensor(NemyEntity, SensorEntity):
     """Implementation of a Nemy sensor."""
 
     entity_description: NemySensorEntityDescription
+    _unrecorded_attributes = NemyEntity._unrecorded_attributes | frozenset({"percentile"})
 
     def __init__(
         self,
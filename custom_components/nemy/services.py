@@ -0,0 +1,161 @@
+"""Services for the Nemy integration."""
+from __future__ import annotations
+
+from functools import partial
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    ServiceValidationError,
+    Unauthorized,
+    UnknownUser,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_ALLOCATIONS,
+    ATTR_CYCLES,
+    ATTR_END,
+    ATTR_FILENAME,
+    ATTR_MODE,
+    ATTR_REGION,
+    ATTR_START,
+    DOMAIN,
+    SERVICE_EXPORT,
+    SERVICE_PROFILE,
+    VALID_STATES,
+)
+from .coordinator import NemyDataUpdateCoordinator
+from .history import export_history
+from .profiler import PROFILE_MODES, NemyUpdateProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_REGION): vol.In(VALID_STATES),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_REGION): vol.In(VALID_STATES),
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(ATTR_MODE, default="deterministic"): vol.In(PROFILE_MODES),
+        vol.Optional(ATTR_ALLOCATIONS, default=True): cv.boolean,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, region: str) -> NemyDataUpdateCoordinator:
+    """Return the coordinator of the loaded entry for a region."""
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if coordinator.api._state == region:
+            return coordinator
+    raise ServiceValidationError(f"No Nemy entry is loaded for region {region}")
+
+
+async def _async_verify_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise unless the call was made by an admin or by Home Assistant itself.
+
+    Same check as ``async_register_admin_service``, which cannot register
+    services that return a response on all supported Home Assistant versions.
+    """
+    if not call.context.user_id:
+        return
+    user = await hass.auth.async_get_user(call.context.user_id)
+    if user is None:
+        raise UnknownUser(context=call.context)
+    if not user.is_admin:
+        raise Unauthorized(context=call.context)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Nemy services."""
+
+    async def async_export(call: ServiceCall) -> ServiceResponse:
+        """Stream collected interval history for a region to a new CSV file."""
+        await _async_verify_admin(hass, call)
+        region = call.data[ATTR_REGION]
+        start = dt_util.as_utc(call.data[ATTR_START]) if ATTR_START in call.data else None
+        end = dt_util.as_utc(call.data[ATTR_END]) if ATTR_END in call.data else None
+        coordinator = _get_coordinator(hass, region)
+
+        if start and end and start >= end:
+            raise ServiceValidationError("Export start must be before end")
+
+        filename = call.data.get(
+            ATTR_FILENAME,
+            f"{DOMAIN}_{region}_{dt_util.now().strftime('%Y%m%d%H%M%S')}.csv",
+        )
+        # Relative paths land in the media directory, which is allowlisted by default
+        export_dir = next(iter(hass.config.media_dirs.values()), hass.config.path("media"))
+        target = filename if os.path.isabs(filename) else os.path.join(export_dir, filename)
+        if not hass.config.is_allowed_path(target):
+            raise ServiceValidationError(f"Export path is not allowed: {target}")
+
+        try:
+            await hass.async_add_executor_job(
+                partial(os.makedirs, os.path.dirname(target), exist_ok=True)
+            )
+            rows = await hass.async_add_executor_job(
+                export_history, coordinator.history, target, start, end
+            )
+        except FileExistsError as err:
+            raise ServiceValidationError(f"Export file already exists: {target}") from err
+        except OSError as err:
+            raise HomeAssistantError(f"Unable to export Nemy history: {err}") from err
+
+        _LOGGER.debug("Exported %d %s intervals to %s", rows, region, target)
+        return {"path": target, "rows": rows}
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles of a region's coordinator."""
+        region = call.data[ATTR_REGION]
+        mode = call.data[ATTR_MODE]
+        coordinator = _get_coordinator(hass, region)
+
+        if coordinator.profiler is not None:
+            raise ServiceValidationError(f"Profiling is already active for region {region}")
+
+        extension = "prof" if mode == "deterministic" else "folded"
+        path = hass.config.path(
+            f"{DOMAIN}_profile_{region}_{dt_util.now().strftime('%Y%m%d%H%M%S')}.{extension}"
+        )
+        coordinator.start_profiling(
+            NemyUpdateProfiler(
+                call.data[ATTR_CYCLES], path, mode, call.data[ATTR_ALLOCATIONS]
+            )
+        )
+        _LOGGER.info(
+            "Profiling the next %d %s update cycles in %s mode",
+            call.data[ATTR_CYCLES],
+            region,
+            mode,
+        )
+
+    # Profiling hooks the whole event loop, so only admins may start it
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        async_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
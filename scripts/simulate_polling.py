@@ -0,0 +1,372 @@
+"""Offline quota and staleness simulator for Nemy polling strategies.
+
+Drives the real NemyDataUpdateCoordinator update logic and NemyApi rate
+limiter against a virtual clock and a synthetic or recorded payload stream,
+then reports request usage, rate-limit hits and data staleness per dispatch
+interval for each strategy.
+
+Requires Home Assistant to be installed. Run from the repository root:
+
+    python scripts/simulate_polling.py --strategy 60 --strategy 300
+    python scripts/simulate_polling.py --strategy 120:30:1000 --payloads recorded.jsonl
+
+A strategy is ``scan_interval[:requests_per_minute[:requests_per_day]]``.
+Recorded payloads are JSON lines of API responses, optionally with a
+``published_at`` ISO timestamp; otherwise publication is assumed to happen
+``--publish-lag`` seconds after the start of the interval. Naive timestamps
+are read in the simulation's default timezone (UTC+10, AEST).
+
+Only the update logic is real: the coordinator's scheduler is not run.
+After each poll the virtual clock is advanced by the coordinator's current
+``update_interval``, which is the delay ``_schedule_refresh`` would arm, so
+rate-limit backoff is honoured but scheduler jitter and the sub-second
+alignment Home Assistant applies to poll times are not modelled.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.nemy.api import NemyApi, NemyRateLimitError
+from custom_components.nemy.const import (
+    DEFAULT_REQUESTS_PER_DAY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SCAN_INTERVAL,
+)
+from custom_components.nemy.coordinator import NemyDataUpdateCoordinator
+
+DISPATCH_INTERVAL = timedelta(minutes=5)
+SIMULATION_START = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=10)))
+
+
+@dataclass
+class Strategy:
+    """A polling configuration to simulate."""
+
+    scan_interval: int
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE
+    requests_per_day: int = DEFAULT_REQUESTS_PER_DAY
+
+    @classmethod
+    def parse(cls, value: str) -> Strategy:
+        """Parse ``scan_interval[:requests_per_minute[:requests_per_day]]``."""
+        return cls(*(int(part) for part in value.split(":")))
+
+    def __str__(self) -> str:
+        """Return the strategy in its command line form."""
+        return f"{self.scan_interval}:{self.requests_per_minute}:{self.requests_per_day}"
+
+
+@dataclass
+class Publication:
+    """A dispatch interval payload and the time it became available."""
+
+    interval: str
+    published_at: datetime
+    payload: dict
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of simulating one strategy."""
+
+    strategy: Strategy
+    polls: int = 0
+    requests: int = 0
+    limiter_hits: int = 0
+    server_429s: int = 0
+    failures: int = 0
+    staleness: list[float] = field(default_factory=list)
+    missed_intervals: int = 0
+    runtime: float = 0.0
+
+
+class VirtualClock:
+    """Shared simulated time."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock."""
+        self.now = start
+
+
+class SimulatedApi(NemyApi):
+    """NemyApi whose rate limiter runs on the virtual clock."""
+
+    def __init__(self, clock: VirtualClock, session: SimulatedSession, strategy: Strategy) -> None:
+        """Initialize the API with the simulated session."""
+        super().__init__("simulated", "NSW1", session)
+        self._clock = clock
+        self.set_rate_limits(strategy.requests_per_minute, strategy.requests_per_day)
+
+    def _now(self) -> datetime:
+        """Return the virtual time as naive local time, like datetime.now()."""
+        return self._clock.now.replace(tzinfo=None)
+
+
+class SimulatedResponse:
+    """Minimal aiohttp response returned by SimulatedSession."""
+
+    def __init__(self, status: int, payload: dict | None) -> None:
+        """Initialize the response."""
+        self.status = status
+        self._payload = payload
+
+    async def __aenter__(self) -> SimulatedResponse:
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Exit the response context."""
+
+    async def json(self) -> dict | None:
+        """Return the payload."""
+        return self._payload
+
+
+class SimulatedSession:
+    """Serves the latest published payload and enforces the server-side quota."""
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        publications: list[Publication],
+        quota_per_minute: int,
+        quota_per_day: int,
+    ) -> None:
+        """Initialize the session."""
+        self._clock = clock
+        self._publications = publications
+        self._index = -1
+        self._quota_per_minute = quota_per_minute
+        self._quota_per_day = quota_per_day
+        self._minute: deque[datetime] = deque()
+        self._day: deque[datetime] = deque()
+        self.requests = 0
+
+    def get(self, url: str, headers: dict, params: dict) -> SimulatedResponse:
+        """Answer a summary request at the current virtual time."""
+        now = self._clock.now
+        while self._minute and self._minute[0] <= now - timedelta(minutes=1):
+            self._minute.popleft()
+        while self._day and self._day[0] <= now - timedelta(days=1):
+            self._day.popleft()
+        if len(self._minute) >= self._quota_per_minute or len(self._day) >= self._quota_per_day:
+            return SimulatedResponse(429, None)
+
+        self._minute.append(now)
+        self._day.append(now)
+        self.requests += 1
+
+        while (
+            self._index + 1 < len(self._publications)
+            and self._publications[self._index + 1].published_at <= now
+        ):
+            self._index += 1
+        if self._index < 0:
+            return SimulatedResponse(503, None)
+        return SimulatedResponse(200, self._publications[self._index].payload)
+
+
+def synthetic_publications(
+    start: datetime, hours: float, lag: float, jitter: float, seed: int
+) -> list[Publication]:
+    """Generate one valid payload per dispatch interval with a random publish lag."""
+    rng = random.Random(seed)
+    publications = []
+    interval = start
+    while interval < start + timedelta(hours=hours):
+        price = max(rng.gauss(30, 10), 0)
+        renewables = min(max(rng.gauss(40, 15), 0), 100)
+        payload = {
+            "time_interval": interval.isoformat(),
+            "price_household": round(price, 2),
+            "price_dispatch": round(price * 3, 2),
+            "price_percentile": rng.randint(0, 100),
+            "price_category": rng.choice(NemyApi.VALID_PRICE_CATEGORIES),
+            "renewables": round(renewables, 1),
+            "renewables_no_rooftop": round(renewables * 0.8, 1),
+            "renewables_percentile": rng.randint(0, 100),
+            "renewables_category": rng.choice(NemyApi.VALID_RENEWABLES_CATEGORIES),
+        }
+        published_at = interval + timedelta(seconds=lag + rng.uniform(0, jitter))
+        publications.append(Publication(payload["time_interval"], published_at, payload))
+        interval += DISPATCH_INTERVAL
+    return publications
+
+
+def recorded_publications(path: str, lag: float) -> list[Publication]:
+    """Load payloads recorded as JSON lines."""
+    publications = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            payload = json.loads(line)
+            interval = dt_util.parse_datetime(str(payload["time_interval"]))
+            if interval is None:
+                raise ValueError(f"Invalid time_interval: {payload['time_interval']}")
+            if interval.tzinfo is None:
+                interval = interval.replace(tzinfo=SIMULATION_START.tzinfo)
+            published = payload.pop("published_at", None)
+            if published is None:
+                published_at = interval + timedelta(seconds=lag)
+            elif (published_at := dt_util.parse_datetime(str(published))) is None:
+                raise ValueError(f"Invalid published_at: {published}")
+            elif published_at.tzinfo is None:
+                published_at = published_at.replace(tzinfo=interval.tzinfo)
+            publications.append(Publication(payload["time_interval"], published_at, payload))
+    publications.sort(key=lambda publication: publication.published_at)
+    return publications
+
+
+async def simulate(
+    config_dir: str,
+    strategy: Strategy,
+    publications: list[Publication],
+    quota_per_minute: int,
+    quota_per_day: int,
+) -> SimulationResult:
+    """Poll the publication stream with one strategy over the simulated period."""
+    wall_start = time.perf_counter()
+    start = publications[0].published_at
+    end = publications[-1].published_at + DISPATCH_INTERVAL
+    clock = VirtualClock(start)
+    session = SimulatedSession(clock, publications, quota_per_minute, quota_per_day)
+    api = SimulatedApi(clock, session, strategy)
+    hass = HomeAssistant(config_dir)
+    coordinator = NemyDataUpdateCoordinator(hass, api, strategy.scan_interval)
+    result = SimulationResult(strategy)
+    published = {publication.interval: publication.published_at for publication in publications}
+    observed: set[str] = set()
+
+    while clock.now < end:
+        result.polls += 1
+        try:
+            data = await coordinator._async_update_data()  # pylint: disable=protected-access
+        except UpdateFailed as err:
+            if isinstance(err.__cause__, NemyRateLimitError):
+                if err.__cause__.retry_after is None:
+                    result.server_429s += 1
+                else:
+                    result.limiter_hits += 1
+            else:
+                result.failures += 1
+        else:
+            interval = data["time_interval"]
+            if interval not in observed:
+                observed.add(interval)
+                result.staleness.append((clock.now - published[interval]).total_seconds())
+
+        # Stand-in for _schedule_refresh, which would arm the next poll
+        # update_interval after this one
+        clock.now += coordinator.update_interval
+
+    result.requests = session.requests
+    result.missed_intervals = len(published) - len(observed)
+    result.runtime = time.perf_counter() - wall_start
+    return result
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))]
+
+
+def format_report(results: list[SimulationResult], hours: float) -> str:
+    """Render the results as a table."""
+    header = (
+        f"{'strategy':>16} {'polls':>6} {'requests':>8} {'req/day':>8} {'limiter':>7} "
+        f"{'429s':>5} {'errors':>6} {'missed':>6} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} {'max s':>7} {'ms':>6}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        staleness = result.staleness or [float("nan")]
+        lines.append(
+            f"{str(result.strategy):>16} {result.polls:>6} {result.requests:>8} "
+            f"{result.requests * 24 / hours:>8.0f} {result.limiter_hits:>7} "
+            f"{result.server_429s:>5} {result.failures:>6} {result.missed_intervals:>6} "
+            f"{statistics.median(staleness):>7.0f} {_percentile(staleness, 90):>7.0f} "
+            f"{_percentile(staleness, 99):>7.0f} {max(staleness):>7.0f} "
+            f"{result.runtime * 1000:>6.0f}"
+        )
+    return "\n".join(lines)
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run every strategy against the same payload stream."""
+    if args.payloads:
+        publications = recorded_publications(args.payloads, args.publish_lag)
+    else:
+        publications = synthetic_publications(
+            SIMULATION_START, args.hours, args.publish_lag, args.publish_jitter, args.seed
+        )
+    if not publications:
+        raise SystemExit("No payloads to simulate")
+    hours = (
+        publications[-1].published_at + DISPATCH_INTERVAL - publications[0].published_at
+    ).total_seconds() / 3600
+
+    strategies = args.strategy or [
+        Strategy(60),
+        Strategy(120),
+        Strategy(DEFAULT_SCAN_INTERVAL),
+        Strategy(600),
+    ]
+
+    results = []
+    for strategy in strategies:
+        # Separate config directories keep each run's interval history apart
+        with tempfile.TemporaryDirectory() as config_dir:
+            results.append(
+                await simulate(
+                    config_dir, strategy, publications, args.quota_per_minute, args.quota_per_day
+                )
+            )
+
+    print(f"Simulated {hours:.1f} h, {len(publications)} dispatch intervals")
+    print(format_report(results, hours))
+
+
+def main() -> None:
+    """Parse arguments and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        type=Strategy.parse,
+        help="scan_interval[:requests_per_minute[:requests_per_day]], repeatable",
+    )
+    parser.add_argument("--payloads", help="JSON lines file of recorded API payloads")
+    parser.add_argument("--hours", type=float, default=24, help="synthetic stream length")
+    parser.add_argument("--publish-lag", type=float, default=30, help="seconds after interval start")
+    parser.add_argument("--publish-jitter", type=float, default=60, help="random extra lag in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quota-per-minute", type=int, default=DEFAULT_REQUESTS_PER_MINUTE)
+    parser.add_argument("--quota-per-day", type=int, default=DEFAULT_REQUESTS_PER_DAY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()